@@ -0,0 +1,34 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def login(client):
+    def _login(email: str, password: str) -> dict:
+        r = client.post("/auth/login", json={"email": email, "password": password})
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+    return _login
+
+
+@pytest.fixture(scope="session")
+def admin(login):
+    return login("admin@cape.co", "admin123")
+
+
+@pytest.fixture(scope="session")
+def customer(login):
+    return login("customer@cape.co", "customer123")
+
+
+@pytest.fixture(scope="session")
+def driver(login):
+    return login("driver@cape.co", "driver123")
@@ -10,39 +10,301 @@
 # NOTE:
 # - Uses in-memory dicts for storage (ORDERS_DB / DRIVERS_DB / USERS_DB).
 # - On Cloud Run, memory resets on redeploy and may not persist across instances.
+# - For the same reason the container runs a single worker process (see Dockerfile).
 # ============================================================
 
-from fastapi import FastAPI, HTTPException, Body, Depends
-from pydantic import BaseModel, Field
-from typing import Dict, Optional, List, Literal
-from uuid import uuid4
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Callable, Deque, Dict, Optional, List, Literal, Set, get_args
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
+from operator import itemgetter
+from array import array
+from collections import OrderedDict, deque
+import asyncio
 import time
 import os
 import hashlib
 import hmac
+import math
+import secrets
+import struct
+
+import msgspec
+from msgspec.structs import force_setattr
+import orjson
 
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-# JWT dependency (install: pip install "python-jose[cryptography]")
-from jose import jwt, JWTError
+# JWT dependency (install: pip install python-jose)
+# HS256 only needs jose's native HMAC backend; skipping the [cryptography]
+# extra keeps that backend (and its import cost) out of cold starts.
+from jose import jwk, jwt, JWTError
+
+# ============================================================
+# Clock
+# - now_ts() returns a cached second-resolution timestamp that a background
+#   task refreshes every 250ms, so hot paths don't call time.time().
+# ============================================================
+
+_NOW = int(time.time())
+
+
+def now_ts() -> int:
+    return _NOW
+
+
+async def _tick_clock() -> None:
+    global _NOW
+    while True:
+        _NOW = int(time.time())
+        await asyncio.sleep(0.25)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ticker = asyncio.create_task(_tick_clock())
+    sweeper = asyncio.create_task(_sweep_terminal_orders())
+    try:
+        yield
+    finally:
+        ticker.cancel()
+        sweeper.cancel()
+
 
 # ============================================================
 # App Initialization
 # ============================================================
 
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson (Rust) instead of the stdlib json module.
+    Defined locally because fastapi.responses.ORJSONResponse is deprecated.
+
+    FastAPI still walks plain return values with jsonable_encoder before they
+    reach the response class, so hot endpoints return an ORJSONResponse
+    themselves and their dicts go straight to orjson.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
 app = FastAPI(
     title="Cape Coast Delivery API",
     description="Local-first food & grocery delivery platform",
     version="0.3.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# Compress larger JSON bodies (driver lists, full orders) for slow mobile links;
+# below ~500 bytes gzip framing eats most of the gain.
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # ============================================================
 # Temporary In-Memory Databases
 # ============================================================
 
-ORDERS_DB: Dict[str, dict] = {}
-DRIVERS_DB: Dict[str, dict] = {}
+OrderStatus = Literal["pending", "confirmed", "assigned", "picked_up", "en_route", "delivered", "cancelled"]
+
+LOCATION_HISTORY_LIMIT = 50  # GPS pings kept per order
+ORDER_RETENTION_SECONDS = int(os.environ.get("ORDER_RETENTION_SECONDS", "3600"))  # delivered/cancelled orders
+
+# Order status -> slot in Order.status_ts (0 = not reached yet).
+ORDER_STATUSES = get_args(OrderStatus)
+STATUS_IDX = {status: i for i, status in enumerate(ORDER_STATUSES)}
+
+
+_LOCATION_POINT = struct.Struct("<dddI")  # lat, lng, accuracy_meters (NaN = unknown), ts
+
+
+class LocationRing:
+    """
+    The last LOCATION_HISTORY_LIMIT GPS pings of an order, packed into one
+    bytearray (28 bytes per point) instead of a dict per point. Points are
+    only decoded back into dicts when a client asks for the history.
+    """
+
+    __slots__ = ("_buf", "_count")
+
+    def __init__(self) -> None:
+        self._buf = bytearray(LOCATION_HISTORY_LIMIT * _LOCATION_POINT.size)
+        self._count = 0  # total pings ever appended
+
+    def __len__(self) -> int:
+        return min(self._count, LOCATION_HISTORY_LIMIT)
+
+    def append(self, lat: float, lng: float, accuracy_meters: Optional[float], ts: int) -> None:
+        offset = (self._count % LOCATION_HISTORY_LIMIT) * _LOCATION_POINT.size
+        accuracy = math.nan if accuracy_meters is None else accuracy_meters
+        _LOCATION_POINT.pack_into(self._buf, offset, lat, lng, accuracy, ts)
+        self._count += 1
+
+    def to_list(self) -> List[dict]:
+        """Oldest point first, same shape as Order.driver_last_location."""
+        n = len(self)
+        start = self._count - n
+        points = []
+        for i in range(start, start + n):
+            lat, lng, accuracy, ts = _LOCATION_POINT.unpack_from(
+                self._buf, (i % LOCATION_HISTORY_LIMIT) * _LOCATION_POINT.size
+            )
+            points.append({
+                "lat": lat,
+                "lng": lng,
+                "accuracy_meters": None if math.isnan(accuracy) else accuracy,
+                "ts": ts,
+            })
+        return points
+
+
+_ORDER_INTERNAL_FIELDS = frozenset({"status_ts", "version"})  # not part of order responses
+
+
+# Records are slotted dataclasses (fixed fields, no per-record hash table);
+# as_dict() is only used to build responses.
+@dataclass(slots=True)
+class Order:
+    order_id: str
+    restaurant_id: str
+    customer_id: str
+    quote: dict
+    created_at: int
+    status: OrderStatus = "pending"
+    status_ts: array = field(default_factory=lambda: array("I", [0] * len(ORDER_STATUSES)))
+    driver_id: Optional[str] = None
+    driver_payout_locked: Optional[float] = None
+    platform_payout_locked: Optional[float] = None
+    delivery_type: str = "hand_to_customer"
+    driver_last_location: Optional[dict] = None
+    pickup_photo_url: Optional[str] = None
+    pickup_confirmed_at: Optional[int] = None
+    delivery_started_at: Optional[int] = None
+    arrival_detected_at: Optional[int] = None
+    delivery_photo_url: Optional[str] = None
+    delivered_at: Optional[int] = None
+    version: int = 0  # bumped on every change; drives GET /orders/{id} ETags
+
+    @property
+    def status_timestamps(self) -> Dict[str, int]:
+        return {status: ts for status, ts in zip(ORDER_STATUSES, self.status_ts) if ts}
+
+    def as_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in _ORDER_INTERNAL_FIELDS}
+        data["status_timestamps"] = self.status_timestamps
+        return data
+
+
+@dataclass(slots=True)
+class Driver:
+    driver_id: str
+    name: str
+    phone: str
+    created_at: int
+    is_available: bool = True
+    current_order_id: Optional[str] = None
+    status_timestamps: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class ShardedDict:
+    """
+    A str-keyed dict split across 16 plain dicts by key hash. Lookups cost one
+    extra index, but growth resizes one small shard at a time instead of
+    rehashing every order at once, which would stall the event loop.
+    """
+
+    __slots__ = ("_shards",)
+
+    def __init__(self) -> None:
+        self._shards: List[dict] = [{} for _ in range(16)]
+
+    def get(self, key: str, default=None):
+        return self._shards[hash(key) & 15].get(key, default)
+
+    def __getitem__(self, key: str):
+        return self._shards[hash(key) & 15][key]
+
+    def __setitem__(self, key: str, value) -> None:
+        self._shards[hash(key) & 15][key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._shards[hash(key) & 15]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def pop(self, key: str, default=None):
+        return self._shards[hash(key) & 15].pop(key, default)
+
+    def values(self) -> List:
+        """A new list, so callers may mutate the store while iterating it."""
+        return [value for shard in self._shards for value in shard.values()]
+
+
+# All handlers are `async def` and run on the event loop. None of them awaits
+# between reading and writing these maps, so each read-modify-write is atomic
+# without an explicit lock. Keep it that way (or add locking) when introducing
+# awaits into a handler.
+ORDERS_DB: ShardedDict = ShardedDict()  # order_id -> Order
+ORDERS_BY_STATUS: Dict[str, Set[str]] = {status: set() for status in ORDER_STATUSES}  # status -> order_ids
+ORDERS_BY_CUSTOMER: Dict[str, Set[str]] = {}  # customer user_id -> order_ids (cancelled ones dropped)
+ORDERS_BY_DRIVER: Dict[str, Set[str]] = {}  # driver_id -> order_ids (cancelled ones dropped)
+LOCATION_HISTORY_DB: Dict[str, LocationRing] = {}  # order_id -> GPS pings; kept off Order so reads stay small
+DRIVERS_DB: Dict[str, Driver] = {}
+AVAILABLE_DRIVERS: OrderedDict[str, None] = OrderedDict()  # driver_ids with is_available=True and no current order, longest-waiting first
 USERS_DB: Dict[str, dict] = {}  # auth users (customer/driver/admin)
+USERS_BY_EMAIL: Dict[str, str] = {}  # normalized email -> user_id
+TERMINAL_ORDERS: Deque[tuple] = deque()  # (terminal_ts, order_id), oldest first; drives eviction
+
+
+_ID_POOL: Deque[str] = deque()  # pregenerated 10-hex-char record id suffixes
+_ID_POOL_BATCH = 256
+
+
+def new_id(prefix: str) -> str:
+    """
+    "ORD-"/"DRV-"/"USR-" + 10 random hex chars. Randomness is drawn from the
+    OS in batches of _ID_POOL_BATCH ids, one getrandom call per batch.
+    """
+    if not _ID_POOL:
+        raw = secrets.token_hex(5 * _ID_POOL_BATCH).upper()
+        _ID_POOL.extend(raw[i:i + 10] for i in range(0, len(raw), 10))
+    return prefix + _ID_POOL.popleft()
+
+
+# Encoded /drivers body, rebuilt on the next request after any driver change.
+# Every driver mutation (register, availability, assign, delivery) goes
+# through mark_driver_available/unavailable, which drop the snapshot.
+_DRIVERS_JSON: Optional[bytes] = None
+_JSON_ENCODER = msgspec.json.Encoder()
+
+
+def drivers_json() -> bytes:
+    global _DRIVERS_JSON
+    if _DRIVERS_JSON is None:
+        _DRIVERS_JSON = _JSON_ENCODER.encode(list(DRIVERS_DB.values()))
+    return _DRIVERS_JSON
+
+
+def mark_driver_available(driver_id: str) -> None:
+    global _DRIVERS_JSON
+    _DRIVERS_JSON = None
+    if driver_id not in AVAILABLE_DRIVERS:
+        AVAILABLE_DRIVERS[driver_id] = None
+
+
+def mark_driver_unavailable(driver_id: str) -> None:
+    global _DRIVERS_JSON
+    _DRIVERS_JSON = None
+    AVAILABLE_DRIVERS.pop(driver_id, None)
 
 # ============================================================
 # Auth / JWT Config
@@ -52,66 +314,101 @@ JWT_SECRET = os.environ.get("JWT_SECRET", "DEV_ONLY_CHANGE_ME")
 JWT_ALG = os.environ.get("JWT_ALG", "HS256")
 JWT_EXP_SECONDS = int(os.environ.get("JWT_EXP_SECONDS", "86400"))  # 24h default
 
+# Key object built once; passing a raw secret makes jose try to parse it as a
+# JWK (a failing json.loads) and rebuild the key on every sign/verify.
+_JWT_KEY = jwk.construct(JWT_SECRET, JWT_ALG)
+
 auth_scheme = HTTPBearer(auto_error=True)
 
 Role = Literal["customer", "driver", "admin"]
 
 
-def now_ts() -> int:
-    return int(time.time())
+# BLAKE2b's max key size is 64 bytes; hashing the secret fits any length into it.
+_PASSWORD_KEY = hashlib.blake2b(JWT_SECRET.encode("utf-8")).digest()
 
 
 def _hash_password(password: str) -> str:
     """
-    MVP password hashing (HMAC-SHA256 w/ server secret).
+    MVP password hashing (keyed BLAKE2b w/ server secret: one C pass, no HMAC double hash).
     For production: use passlib bcrypt/argon2 + per-user salt.
     """
-    msg = password.encode("utf-8")
-    key = JWT_SECRET.encode("utf-8")
-    return hmac.new(key, msg, hashlib.sha256).hexdigest()
+    return hashlib.blake2b(password.encode("utf-8"), key=_PASSWORD_KEY, digest_size=32).hexdigest()
 
 
 def create_user(*, email: str, password: str, role: Role, driver_id: Optional[str] = None) -> dict:
-    user_id = f"USR-{uuid4().hex[:10].upper()}"
+    email = email.lower().strip()
+    if email in USERS_BY_EMAIL:
+        raise HTTPException(status_code=409, detail="Email already registered")
+
+    user_id = new_id("USR-")
     record = {
         "user_id": user_id,
-        "email": email.lower().strip(),
+        "email": email,
         "password_hash": _hash_password(password),
         "role": role,
         "driver_id": driver_id,
         "created_at": now_ts(),
     }
     USERS_DB[user_id] = record
+    USERS_BY_EMAIL[email] = user_id
     return record
 
 
 def find_user_by_email(email: str) -> Optional[dict]:
-    email = email.lower().strip()
-    for u in USERS_DB.values():
-        if u["email"] == email:
-            return u
-    return None
+    user_id = USERS_BY_EMAIL.get(email.lower().strip())
+    return USERS_DB.get(user_id) if user_id else None
 
 
 def create_access_token(user: dict) -> str:
+    ts = now_ts()
     payload = {
         "sub": user["user_id"],
         "role": user["role"],
         "driver_id": user.get("driver_id"),
-        "iat": now_ts(),
-        "exp": now_ts() + JWT_EXP_SECONDS,
+        "iat": ts,
+        "exp": ts + JWT_EXP_SECONDS,
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
+    return jwt.encode(payload, _JWT_KEY, algorithm=JWT_ALG)
+
+
+_JWT_ALGS = [JWT_ALG]
+_JWT_DECODE_OPTS = {"require_exp": True, "require_sub": True, "verify_aud": False}
 
 
-def get_current_user(creds: HTTPAuthorizationCredentials = Depends(auth_scheme)) -> dict:
-    token = creds.credentials
+_TOKEN_CACHE_SIZE = 10_000
+_TOKEN_CACHE: OrderedDict[bytes, tuple] = OrderedDict()  # sha256(token) -> (user_id, exp), LRU order
+
+
+def _verify_token(token: str) -> tuple:
+    """
+    Signature + claims check, done once per token; returns (user_id, exp).
+    Tokens are immutable, so later hits only need the expiry re-checked.
+    Entries are keyed by the token's SHA-256 digest (32 bytes instead of the
+    full token string); expired entries are dropped on lookup and re-decoded,
+    so jose raises for them. Failures raise and are therefore never cached.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = _TOKEN_CACHE.get(key)
+    if cached is not None:
+        if cached[1] > now_ts():
+            _TOKEN_CACHE.move_to_end(key)
+            return cached
+        del _TOKEN_CACHE[key]
+
+    payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGS, options=_JWT_DECODE_OPTS)
+    cached = payload["sub"], payload["exp"]
+    _TOKEN_CACHE[key] = cached
+    if len(_TOKEN_CACHE) > _TOKEN_CACHE_SIZE:
+        _TOKEN_CACHE.popitem(last=False)
+    return cached
+
+
+async def get_current_user(creds: HTTPAuthorizationCredentials = Depends(auth_scheme)) -> dict:
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
+        user_id, _ = _verify_token(creds.credentials)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user_id = payload.get("sub")
     if not user_id or user_id not in USERS_DB:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -121,13 +418,22 @@ def get_current_user(creds: HTTPAuthorizationCredentials = Depends(auth_scheme))
 
 
 def require_role(*allowed_roles: Role):
-    def _guard(user: dict = Depends(get_current_user)) -> dict:
-        if user["role"] not in allowed_roles:
+    allowed = frozenset(allowed_roles)
+
+    async def _guard(user: dict = Depends(get_current_user)) -> dict:
+        if user["role"] not in allowed:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         return user
     return _guard
 
 
+# Shared guards: one dependency object per role set instead of a fresh
+# closure per route.
+_ADMIN = require_role("admin")
+_DRIVER_OR_ADMIN = require_role("driver", "admin")
+_CUSTOMER_OR_ADMIN = require_role("customer", "admin")  # admin allowed for testing
+
+
 # ============================================================
 # Seed Users (MVP)
 # - Remove later; replace with proper registration + persistence.
@@ -145,16 +451,16 @@ def seed_users_once():
 
     # Example driver (driver record created below at runtime in /drivers/register too)
     # We'll create a driver record now to link the driver user.
-    driver_id = f"DRV-{uuid4().hex[:10].upper()}"
-    DRIVERS_DB[driver_id] = {
-        "driver_id": driver_id,
-        "name": "Seed Driver",
-        "phone": "0000000000",
-        "is_available": True,
-        "current_order_id": None,
-        "created_at": now_ts(),
-        "status_timestamps": {"created": now_ts()},
-    }
+    driver_id = new_id("DRV-")
+    ts = now_ts()
+    DRIVERS_DB[driver_id] = Driver(
+        driver_id=driver_id,
+        name="Seed Driver",
+        phone="0000000000",
+        created_at=ts,
+        status_timestamps={"created": ts},
+    )
+    mark_driver_available(driver_id)
     create_user(email="driver@cape.co", password="driver123", role="driver", driver_id=driver_id)
 
 
@@ -164,51 +470,107 @@ seed_users_once()
 # Economic / Pricing Logic
 # ============================================================
 
-def calculate_quote(food_subtotal: float, platform_fee: float, delivery_fee: float) -> dict:
-    margin_pool = platform_fee + delivery_fee
-    platform_net = round(margin_pool * 0.60, 2)
-    driver_base = round(margin_pool * 0.40, 2)
-    customer_total = round(food_subtotal + margin_pool, 2)
+def to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+@lru_cache(maxsize=4096)
+def _quote_from_cents(food_cents: int, platform_fee_cents: int, delivery_fee_cents: int) -> dict:
+    """
+    All money math is done in integer cents (no float drift, no per-field round()).
+    The 60/40 margin split rounds the platform share half-up to the cent (the
+    same payouts the old per-share round() produced) and gives the driver the
+    remainder, so the payouts always add up to the margin pool exactly.
+    Values are converted back to dollars only when building the response.
+    """
+    margin_pool = platform_fee_cents + delivery_fee_cents
+    platform_net = (margin_pool * 60 + 50) // 100
+    driver_base = margin_pool - platform_net
+    customer_total = food_cents + margin_pool
 
     return {
-        "food_subtotal": round(food_subtotal, 2),
-        "fees": {
-            "platform_fee": round(platform_fee, 2),
-            "delivery_fee": round(delivery_fee, 2),
-        },
-        "margin_pool": round(margin_pool, 2),
-        "payouts": {
-            "restaurant": round(food_subtotal, 2),
-            "platform_net": platform_net,
-            "driver_base": driver_base,
-        },
-        "customer_total": customer_total,
+        "food_subtotal": food_cents / 100,
+        "platform_fee": platform_fee_cents / 100,
+        "delivery_fee": delivery_fee_cents / 100,
+        "margin_pool": margin_pool / 100,
+        "restaurant_payout": food_cents / 100,
+        "platform_net": platform_net / 100,
+        "driver_base": driver_base / 100,
+        "customer_total": customer_total / 100,
+        "valid": True,
+    }
+
+
+def calculate_quote(food_cents: int, platform_fee_cents: int, delivery_fee_cents: int) -> dict:
+    """
+    Quotes are pure functions of the cents triple, so checkout previews that
+    resend the same amounts hit the LRU. The cached dict is flat, so a shallow
+    copy keeps callers from mutating the shared entry.
+    """
+    return dict(_quote_from_cents(food_cents, platform_fee_cents, delivery_fee_cents))
+
+
+_PREVIEW_FIELDS = itemgetter(
+    "food_subtotal", "platform_fee", "delivery_fee", "margin_pool",
+    "restaurant_payout", "platform_net", "driver_base", "customer_total",
+)
+
+
+def quote_preview(quote: dict) -> dict:
+    """
+    Nested fees/payouts shape returned by /orders/quote, built from the flat
+    quote. Only reads `quote`, so it may be handed the cached entry directly.
+    """
+    food, platform_fee, delivery_fee, margin_pool, restaurant, platform_net, driver_base, total = _PREVIEW_FIELDS(quote)
+    return {
+        "food_subtotal": food,
+        "fees": {"platform_fee": platform_fee, "delivery_fee": delivery_fee},
+        "margin_pool": margin_pool,
+        "payouts": {"restaurant": restaurant, "platform_net": platform_net, "driver_base": driver_base},
+        "customer_total": total,
         "valid": True,
     }
 
+
+@lru_cache(maxsize=4096)
+def quote_preview_json(food_cents: int, platform_fee_cents: int, delivery_fee_cents: int) -> bytes:
+    """/orders/quote body for a cents triple, encoded once and served as bytes."""
+    return orjson.dumps(quote_preview(_quote_from_cents(food_cents, platform_fee_cents, delivery_fee_cents)))
+
 # ============================================================
 # Order Lifecycle Rules
 # ============================================================
 
-ALLOWED_TRANSITIONS = {
-    "pending": ["confirmed", "cancelled"],
-    "confirmed": ["assigned", "cancelled"],
-    "assigned": ["picked_up", "cancelled"],
-    "picked_up": ["en_route"],
-    "en_route": ["delivered"],
-    "delivered": [],
-    "cancelled": [],
+# Keyed by every OrderStatus, so safe_transition can index without a default.
+ALLOWED_TRANSITIONS: Dict[str, frozenset] = {
+    "pending": frozenset({"confirmed", "cancelled"}),
+    "confirmed": frozenset({"assigned", "cancelled"}),
+    "assigned": frozenset({"picked_up", "cancelled"}),
+    "picked_up": frozenset({"en_route"}),
+    "en_route": frozenset({"delivered"}),
+    "delivered": frozenset(),
+    "cancelled": frozenset(),
 }
 
+# Orders in these states are evicted ORDER_RETENTION_SECONDS after reaching them.
+TERMINAL_STATUSES = frozenset({"delivered", "cancelled"})
+
+# States in which the assigned driver may post GPS pings.
+LOCATION_OK_STATES = frozenset({"assigned", "picked_up", "en_route"})
+
 # ============================================================
 # Request / Response Models
 # ============================================================
 
 class LoginRequest(BaseModel):
-    email: str = Field(min_length=5)
-    password: str = Field(min_length=3)
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    email: Annotated[str, Field(min_length=5)]
+    password: Annotated[str, Field(min_length=3)]
 
 class TokenResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     access_token: str
     token_type: str = "bearer"
     role: Role
@@ -216,15 +578,46 @@ class TokenResponse(BaseModel):
     driver_id: Optional[str] = None
     expires_in: int
 
-class OrderQuoteRequest(BaseModel):
-    food_subtotal: float = Field(gt=0)
-    platform_fee: float = Field(ge=0)
-    delivery_fee: float = Field(ge=0)
+class RequestStruct(msgspec.Struct, forbid_unknown_fields=True, frozen=True):
+    """
+    Base for msgspec request bodies: unknown fields are rejected and decoded
+    bodies are immutable. Subclasses strip/validate string fields in
+    __post_init__ (via force_setattr); a ValueError raised there surfaces as a
+    422 from json_body().
+    """
+
+def _strip_required(value: str, field: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError(f"{field} cannot be empty")
+    return value
+
+class OrderQuoteRequest(RequestStruct):
+    food_subtotal: Annotated[float, msgspec.Meta(gt=0)]
+    platform_fee: Annotated[float, msgspec.Meta(ge=0)]
+    delivery_fee: Annotated[float, msgspec.Meta(ge=0)]
+
+    def __post_init__(self):
+        for name in ("food_subtotal", "platform_fee", "delivery_fee"):
+            amount = getattr(self, name)
+            if round(amount, 2) != amount:
+                raise ValueError(f"{name} must have at most 2 decimal places")
+
+    def cents(self) -> tuple:
+        return to_cents(self.food_subtotal), to_cents(self.platform_fee), to_cents(self.delivery_fee)
 
 class CreateOrderRequest(OrderQuoteRequest):
-    restaurant_id: str = Field(min_length=1)
+    restaurant_id: Annotated[str, msgspec.Meta(min_length=1)]
+
+    def __post_init__(self):
+        super().__post_init__()
+        force_setattr(self, "restaurant_id", _strip_required(self.restaurant_id, "restaurant_id"))
 
+# Endpoints reference OrderResponse/DriverResponse via `responses=`
+# (docs only) so records we build ourselves are not re-validated on the way out.
 class OrderResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     order_id: str
     restaurant_id: str
     status: str
@@ -232,14 +625,20 @@ class OrderResponse(BaseModel):
     created_at: int
     customer_id: str
 
-class OrderStatusUpdate(BaseModel):
-    new_status: str = Field(min_length=1)
+class OrderStatusUpdate(RequestStruct):
+    new_status: OrderStatus
+
+class RegisterDriverRequest(RequestStruct):
+    name: Annotated[str, msgspec.Meta(min_length=1)]
+    phone: Annotated[str, msgspec.Meta(min_length=6)]
 
-class RegisterDriverRequest(BaseModel):
-    name: str = Field(min_length=1)
-    phone: str = Field(min_length=6)
+    def __post_init__(self):
+        force_setattr(self, "name", _strip_required(self.name, "name"))
+        force_setattr(self, "phone", _strip_required(self.phone, "phone"))
 
 class DriverResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     driver_id: str
     name: str
     phone: str
@@ -247,63 +646,142 @@ class DriverResponse(BaseModel):
     current_order_id: Optional[str] = None
     created_at: int
 
-class SetDriverAvailabilityRequest(BaseModel):
+class SetDriverAvailabilityRequest(RequestStruct):
     is_available: bool
 
-class AssignDriverRequest(BaseModel):
+class AssignDriverRequest(RequestStruct):
     driver_id: Optional[str] = None
 
-class DriverLocationPing(BaseModel):
-    lat: float = Field(ge=-90, le=90)
-    lng: float = Field(ge=-180, le=180)
-    accuracy_meters: Optional[float] = Field(default=None, ge=0)
+    def __post_init__(self):
+        if self.driver_id is not None:
+            force_setattr(self, "driver_id", self.driver_id.strip())
+
+class DriverLocationPing(RequestStruct):
+    lat: Annotated[float, msgspec.Meta(ge=-90, le=90)]
+    lng: Annotated[float, msgspec.Meta(ge=-180, le=180)]
+    accuracy_meters: Optional[Annotated[float, msgspec.Meta(ge=0)]] = None
 
-class DriverActionRequest(BaseModel):
-    driver_id: str = Field(min_length=5)
+class DriverActionRequest(RequestStruct):
+    driver_id: Annotated[str, msgspec.Meta(min_length=5)]
 
 class PickupRequest(DriverActionRequest):
-    pickup_photo_url: str = Field(min_length=10)
+    pickup_photo_url: Annotated[str, msgspec.Meta(min_length=10, pattern="^https?://")]
 
 class CompleteDeliveryRequest(DriverActionRequest):
     delivery_photo_url: Optional[str] = None
     handed_to_customer: Optional[bool] = None
 
+BATCH_MAX_ITEMS = 100
+
+# Batch create items are decoded one by one, so a bad item fails alone;
+# the schema alias is what OpenAPI shows for the body.
+BatchCreateOrdersBody = Annotated[List[msgspec.Raw], msgspec.Meta(min_length=1, max_length=BATCH_MAX_ITEMS)]
+BatchCreateOrdersSchema = Annotated[List[CreateOrderRequest], msgspec.Meta(min_length=1, max_length=BATCH_MAX_ITEMS)]
+
+class BatchConfirmRequest(RequestStruct):
+    order_ids: Annotated[List[str], msgspec.Meta(min_length=1, max_length=BATCH_MAX_ITEMS)]
+
+
+def json_body(model: type, *, optional: bool = False, schema: Optional[type] = None):
+    """
+    Dependency that decodes the raw request body straight into a msgspec Struct
+    (JSON parse + validation in one C pass, no Pydantic).
+    Errors surface as 422, like FastAPI's own body validation.
+    `schema` overrides the type documented in OpenAPI (defaults to `model`).
+    """
+    decoder = msgspec.json.Decoder(model)
+
+    async def _decode(request: Request):
+        raw = await request.body()
+        if optional and not raw:
+            return None
+        try:
+            return decoder.decode(raw)
+        except (msgspec.ValidationError, msgspec.DecodeError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    # Read by openapi() to document the body FastAPI itself can't see.
+    _decode.body_model = schema or model
+    _decode.body_optional = optional
+    return _decode
+
 # ============================================================
 # Helper Functions
 # ============================================================
 
-def safe_transition(order: dict, requested_status: str) -> None:
-    requested_status = requested_status.strip()
-    current_status = order["status"]
-    allowed = ALLOWED_TRANSITIONS.get(current_status, [])
-
-    if requested_status not in allowed:
+def safe_transition(order: Order, requested_status: OrderStatus, ts: Optional[int] = None) -> None:
+    current_status = order.status
+    if requested_status not in ALLOWED_TRANSITIONS[current_status]:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid transition: {current_status} -> {requested_status}",
         )
 
-    order["status"] = requested_status
-    order.setdefault("status_timestamps", {})
-    order["status_timestamps"][requested_status] = now_ts()
-
-
-def pick_available_driver() -> dict:
-    for d in DRIVERS_DB.values():
-        if d.get("is_available") is True and d.get("current_order_id") is None:
-            return d
-    raise HTTPException(status_code=409, detail="No available drivers right now")
-
-
-def assert_driver_authorized(order: dict, driver_id: str) -> None:
-    assigned_driver_id = order.get("driver_id")
+    ORDERS_BY_STATUS[current_status].discard(order.order_id)
+    ORDERS_BY_STATUS[requested_status].add(order.order_id)
+    if requested_status == "cancelled":
+        _discard_indexed(ORDERS_BY_CUSTOMER, order.customer_id, order.order_id)
+        _discard_indexed(ORDERS_BY_DRIVER, order.driver_id, order.order_id)
+    if ts is None:
+        ts = now_ts()
+    order.status = requested_status
+    order.status_ts[STATUS_IDX[requested_status]] = ts
+    order.version += 1
+    if requested_status in TERMINAL_STATUSES:
+        TERMINAL_ORDERS.append((ts, order.order_id))
+
+
+def _discard_indexed(index: Dict[str, Set[str]], key: Optional[str], order_id: str) -> None:
+    order_ids = index.get(key)
+    if order_ids is not None:
+        order_ids.discard(order_id)
+        if not order_ids:
+            del index[key]
+
+
+def evict_terminal_orders(now: int) -> int:
+    """
+    Drops delivered/cancelled orders that have been terminal for longer than
+    ORDER_RETENTION_SECONDS, along with their index entries. Returns the count.
+    """
+    cutoff = now - ORDER_RETENTION_SECONDS
+    evicted = 0
+    while TERMINAL_ORDERS and TERMINAL_ORDERS[0][0] <= cutoff:
+        _, order_id = TERMINAL_ORDERS.popleft()
+        order = ORDERS_DB.pop(order_id, None)
+        if order is None:
+            continue
+        LOCATION_HISTORY_DB.pop(order_id, None)
+        ORDERS_BY_STATUS[order.status].discard(order_id)
+        _discard_indexed(ORDERS_BY_CUSTOMER, order.customer_id, order_id)
+        _discard_indexed(ORDERS_BY_DRIVER, order.driver_id, order_id)
+        evicted += 1
+    return evicted
+
+
+async def _sweep_terminal_orders() -> None:
+    while True:
+        await asyncio.sleep(60)
+        evict_terminal_orders(now_ts())
+
+
+def pick_available_driver() -> Driver:
+    """Pops the longest-waiting available driver."""
+    if not AVAILABLE_DRIVERS:
+        raise HTTPException(status_code=409, detail="No available drivers right now")
+    driver_id, _ = AVAILABLE_DRIVERS.popitem(last=False)
+    return DRIVERS_DB[driver_id]
+
+
+def assert_driver_authorized(order: Order, driver_id: str) -> None:
+    assigned_driver_id = order.driver_id
     if not assigned_driver_id:
         raise HTTPException(status_code=400, detail="No driver assigned to this order")
     if driver_id != assigned_driver_id:
         raise HTTPException(status_code=403, detail="Driver not authorized for this order")
 
 
-def assert_order_access(order: dict, user: dict) -> None:
+def assert_order_access(order: Order, user: dict) -> None:
     """
     customer: must own order
     driver: must be assigned to order
@@ -313,18 +791,64 @@ def assert_order_access(order: dict, user: dict) -> None:
         return
 
     if user["role"] == "customer":
-        if order.get("customer_id") != user["user_id"]:
+        if order.customer_id != user["user_id"]:
             raise HTTPException(status_code=403, detail="Not allowed to view this order")
         return
 
     if user["role"] == "driver":
-        if order.get("driver_id") != user.get("driver_id"):
+        if order.driver_id != user.get("driver_id"):
             raise HTTPException(status_code=403, detail="Not allowed to view this order")
         return
 
     raise HTTPException(status_code=403, detail="Not allowed")
 
 
+def orders_for_user(user: dict) -> List[Order]:
+    """
+    customer: orders they placed
+    driver: orders assigned to them
+    admin: every order
+    """
+    if user["role"] == "admin":
+        return ORDERS_DB.values()
+
+    if user["role"] == "customer":
+        order_ids = ORDERS_BY_CUSTOMER.get(user["user_id"], ())
+    else:
+        order_ids = ORDERS_BY_DRIVER.get(user.get("driver_id"), ())
+    return [ORDERS_DB[order_id] for order_id in order_ids]
+
+
+def place_order(payload: CreateOrderRequest, customer_id: str, ts: int) -> Order:
+    order = Order(
+        order_id=new_id("ORD-"),
+        restaurant_id=payload.restaurant_id,
+        customer_id=customer_id,
+        quote=calculate_quote(*payload.cents()),
+        created_at=ts,
+    )
+    order.status_ts[STATUS_IDX["pending"]] = ts
+
+    ORDERS_DB[order.order_id] = order
+    ORDERS_BY_STATUS["pending"].add(order.order_id)
+    ORDERS_BY_CUSTOMER.setdefault(customer_id, set()).add(order.order_id)
+    return order
+
+
+def confirm_order_for(order_id: str, user: dict) -> Order:
+    order = ORDERS_DB.get(order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    # customer must own, driver cannot confirm
+    if user["role"] not in ("customer", "admin"):
+        raise HTTPException(status_code=403, detail="Only customer or admin can confirm")
+
+    assert_order_access(order, user)
+    safe_transition(order, "confirmed")
+    return order
+
+
 def assert_driver_user_matches(user: dict, driver_id: str) -> None:
     if user["role"] != "driver":
         raise HTTPException(status_code=403, detail="Driver role required")
@@ -332,13 +856,49 @@ def assert_driver_user_matches(user: dict, driver_id: str) -> None:
         raise HTTPException(status_code=403, detail="Driver token does not match driver_id")
 
 
+def _validate_leave_at_door(order: Order, payload: CompleteDeliveryRequest) -> None:
+    if not payload.delivery_photo_url:
+        raise HTTPException(status_code=400, detail="Delivery photo required for leave-at-door orders")
+    order.delivery_photo_url = payload.delivery_photo_url
+
+
+def _validate_hand_to_customer(order: Order, payload: CompleteDeliveryRequest) -> None:
+    if payload.handed_to_customer is not True:
+        raise HTTPException(status_code=400, detail="Driver must confirm handoff to customer")
+
+
+def _no_completion_check(order: Order, payload: CompleteDeliveryRequest) -> None:
+    return None
+
+
+# Per-delivery-type proof checks run by complete_delivery; a new delivery type
+# only needs an entry here.
+COMPLETION_VALIDATORS: Dict[str, Callable[[Order, CompleteDeliveryRequest], None]] = {
+    "leave_at_door": _validate_leave_at_door,
+    "hand_to_customer": _validate_hand_to_customer,
+}
+
+
 # ============================================================
 # Health Check
 # ============================================================
 
+# Everything but `ts` is constant, so the body is pre-encoded once.
+_ROOT_BODY_PREFIX = orjson.dumps({"message": "Cape Coast API running", "version": app.version})[:-1] + b',"ts":'
+
+
 @app.get("/")
-def root():
-    return {"message": "Cape Coast API running", "ts": now_ts(), "version": app.version}
+async def root():
+    return Response(_ROOT_BODY_PREFIX + str(now_ts()).encode() + b"}", media_type="application/json")
+
+
+# Liveness probe target: constant body, kept out of the OpenAPI schema.
+_HEALTH_BODY = orjson.dumps({"ok": True})
+
+
+@app.get("/health", include_in_schema=False)
+async def health():
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 # ============================================================
@@ -346,12 +906,12 @@ def root():
 # ============================================================
 
 @app.post("/auth/login", response_model=TokenResponse)
-def login(payload: LoginRequest):
+async def login(payload: LoginRequest):
     user = find_user_by_email(payload.email)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    if _hash_password(payload.password) != user["password_hash"]:
+    if not hmac.compare_digest(_hash_password(payload.password), user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     token = create_access_token(user)
@@ -365,7 +925,7 @@ def login(payload: LoginRequest):
 
 
 @app.get("/auth/me")
-def me(user: dict = Depends(get_current_user)):
+async def me(user: dict = Depends(get_current_user)):
     return {
         "user_id": user["user_id"],
         "email": user["email"],
@@ -380,58 +940,114 @@ def me(user: dict = Depends(get_current_user)):
 # ============================================================
 
 @app.post("/orders/quote")
-def quote_order(payload: OrderQuoteRequest):
-    return calculate_quote(payload.food_subtotal, payload.platform_fee, payload.delivery_fee)
+async def quote_order(payload: OrderQuoteRequest = Depends(json_body(OrderQuoteRequest))):
+    return Response(quote_preview_json(*payload.cents()), media_type="application/json")
 
 
 # ============================================================
 # Orders: Create (CUSTOMER)
 # ============================================================
 
-@app.post("/orders", response_model=OrderResponse)
-def create_order(
-    payload: CreateOrderRequest,
-    user: dict = Depends(require_role("customer", "admin")),  # allow admin for testing
+@app.post("/orders", responses={200: {"model": OrderResponse}})
+async def create_order(
+    payload: CreateOrderRequest = Depends(json_body(CreateOrderRequest)),
+    user: dict = Depends(_CUSTOMER_OR_ADMIN),
 ):
-    restaurant_id = payload.restaurant_id.strip()
-    if not restaurant_id:
-        raise HTTPException(status_code=400, detail="restaurant_id cannot be empty")
+    order = place_order(payload, user["user_id"], now_ts())
+    return ORJSONResponse(order.as_dict())
 
-    quote = calculate_quote(payload.food_subtotal, payload.platform_fee, payload.delivery_fee)
 
-    order_id = f"ORD-{uuid4().hex[:10].upper()}"
-    ts = now_ts()
+# ============================================================
+# Orders: Batch Create / Confirm
+# - Up to BATCH_MAX_ITEMS per request; results come back in input order with
+#   a per-item ok flag (create results also carry their input index), so one
+#   bad item doesn't fail the rest.
+# - Declared before /orders/{order_id}/... so "batch" isn't taken as an id.
+# ============================================================
 
-    order_record = {
-        "order_id": order_id,
-        "restaurant_id": restaurant_id,
-        "status": "pending",
-        "quote": quote,
-        "created_at": ts,
-        "status_timestamps": {"pending": ts},
-        "driver_id": None,
-        "driver_payout_locked": None,
-        "platform_payout_locked": None,
-        "delivery_type": "hand_to_customer",
-        "customer_id": user["user_id"],
-    }
+_CREATE_ORDER_DECODER = msgspec.json.Decoder(CreateOrderRequest)
 
-    ORDERS_DB[order_id] = order_record
-    return order_record
+
+@app.post("/orders/batch")
+async def create_orders_batch(
+    items: List[msgspec.Raw] = Depends(json_body(BatchCreateOrdersBody, schema=BatchCreateOrdersSchema)),
+    user: dict = Depends(_CUSTOMER_OR_ADMIN),
+):
+    ts = now_ts()
+    customer_id = user["user_id"]
+    results = []
+    for i, raw in enumerate(items):
+        try:
+            payload = _CREATE_ORDER_DECODER.decode(raw)
+        except (msgspec.ValidationError, msgspec.DecodeError) as exc:
+            results.append({"index": i, "ok": False, "status_code": 422, "error": str(exc)})
+            continue
+        results.append({"index": i, "ok": True, "order": place_order(payload, customer_id, ts).as_dict()})
+    return ORJSONResponse(results)
+
+
+@app.post("/orders/batch/confirm")
+async def confirm_orders_batch(
+    payload: BatchConfirmRequest = Depends(json_body(BatchConfirmRequest)),
+    user: dict = Depends(get_current_user),
+):
+    results = []
+    for order_id in payload.order_ids:
+        try:
+            order = confirm_order_for(order_id, user)
+        except HTTPException as exc:
+            results.append({"order_id": order_id, "ok": False, "status_code": exc.status_code, "error": exc.detail})
+            continue
+        results.append({
+            "order_id": order_id,
+            "ok": True,
+            "status": order.status,
+            "confirmed_at": order.status_ts[STATUS_IDX["confirmed"]],
+        })
+    return ORJSONResponse(results)
 
 
 # ============================================================
 # Orders: Retrieve (ROLE-AWARE)
 # ============================================================
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison: any listed tag (W/ prefix ignored) or * matches."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
 @app.get("/orders/{order_id}")
-def get_order(order_id: str, user: dict = Depends(get_current_user)):
+async def get_order(
+    order_id: str,
+    request: Request,
+    include_history: bool = False,
+    user: dict = Depends(get_current_user),
+):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
     assert_order_access(order, user)
-    return order
+
+    # Polling clients send the ETag back; an unchanged order costs no encoding.
+    # Weak, since gzipped and identity responses of one version share the tag.
+    etag = f'W/"{order.version}{"h" if include_history else ""}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=1"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    data = order.as_dict()
+    if include_history:
+        history = LOCATION_HISTORY_DB.get(order_id)
+        data["driver_location_history"] = history.to_list() if history is not None else []
+    return ORJSONResponse(data, headers=headers)
 
 
 # ============================================================
@@ -439,23 +1055,14 @@ def get_order(order_id: str, user: dict = Depends(get_current_user)):
 # ============================================================
 
 @app.post("/orders/{order_id}/confirm")
-def confirm_order(order_id: str, user: dict = Depends(get_current_user)):
-    order = ORDERS_DB.get(order_id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    # customer must own, driver cannot confirm
-    if user["role"] not in ("customer", "admin"):
-        raise HTTPException(status_code=403, detail="Only customer or admin can confirm")
-
-    assert_order_access(order, user)
-    safe_transition(order, "confirmed")
+async def confirm_order(order_id: str, user: dict = Depends(get_current_user)):
+    order = confirm_order_for(order_id, user)
 
     return {
         "order_id": order_id,
-        "status": order["status"],
-        "confirmed_at": order["status_timestamps"]["confirmed"],
-        "quote": order["quote"],
+        "status": order.status,
+        "confirmed_at": order.status_ts[STATUS_IDX["confirmed"]],
+        "quote": order.quote,
     }
 
 
@@ -464,10 +1071,10 @@ def confirm_order(order_id: str, user: dict = Depends(get_current_user)):
 # ============================================================
 
 @app.patch("/orders/{order_id}/status")
-def update_order_status(
+async def update_order_status(
     order_id: str,
-    payload: OrderStatusUpdate,
-    user: dict = Depends(require_role("admin")),
+    payload: OrderStatusUpdate = Depends(json_body(OrderStatusUpdate)),
+    user: dict = Depends(_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
@@ -477,8 +1084,8 @@ def update_order_status(
 
     return {
         "order_id": order_id,
-        "new_status": order["status"],
-        "status_timestamps": order.get("status_timestamps", {}),
+        "new_status": order.status,
+        "status_timestamps": order.status_timestamps,
     }
 
 
@@ -486,43 +1093,41 @@ def update_order_status(
 # Drivers: Register/List/Availability (ADMIN for register/list; DRIVER for self availability)
 # ============================================================
 
-@app.post("/drivers/register", response_model=DriverResponse)
-def register_driver(payload: RegisterDriverRequest, user: dict = Depends(require_role("admin"))):
-    name = payload.name.strip()
-    phone = payload.phone.strip()
-    if not name:
-        raise HTTPException(status_code=400, detail="name cannot be empty")
-    if not phone:
-        raise HTTPException(status_code=400, detail="phone cannot be empty")
-
-    driver_id = f"DRV-{uuid4().hex[:10].upper()}"
-    record = {
-        "driver_id": driver_id,
-        "name": name,
-        "phone": phone,
-        "is_available": True,
-        "current_order_id": None,
-        "created_at": now_ts(),
-        "status_timestamps": {"created": now_ts()},
-    }
-    DRIVERS_DB[driver_id] = record
+@app.post("/drivers/register", responses={200: {"model": DriverResponse}})
+async def register_driver(payload: RegisterDriverRequest = Depends(json_body(RegisterDriverRequest)), user: dict = Depends(_ADMIN)):
+    driver_id = new_id("DRV-")
+    ts = now_ts()
+    driver = Driver(
+        driver_id=driver_id,
+        name=payload.name,
+        phone=payload.phone,
+        created_at=ts,
+        status_timestamps={"created": ts},
+    )
+    DRIVERS_DB[driver_id] = driver
+    mark_driver_available(driver_id)
 
     # Optional: create a linked driver user account (MVP default password)
     create_user(email=f"{driver_id.lower()}@drivers.cape.co", password="driver123", role="driver", driver_id=driver_id)
 
-    return record
+    return ORJSONResponse(driver.as_dict())
 
 
-@app.get("/drivers", response_model=List[DriverResponse])
-def list_drivers(user: dict = Depends(require_role("admin"))):
-    return list(DRIVERS_DB.values())
+# msgspec encodes the Driver dataclasses straight to JSON bytes in C.
+@app.get("/drivers", responses={200: {"model": List[DriverResponse]}})
+async def list_drivers(available_only: bool = False, user: dict = Depends(_ADMIN)):
+    if available_only:
+        # O(available drivers), longest-waiting first (the auto-assign order).
+        body = _JSON_ENCODER.encode([DRIVERS_DB[driver_id] for driver_id in AVAILABLE_DRIVERS])
+        return Response(body, media_type="application/json")
+    return Response(drivers_json(), media_type="application/json")
 
 
-@app.patch("/drivers/{driver_id}/availability", response_model=DriverResponse)
-def set_driver_availability(
+@app.patch("/drivers/{driver_id}/availability", responses={200: {"model": DriverResponse}})
+async def set_driver_availability(
     driver_id: str,
-    payload: SetDriverAvailabilityRequest,
-    user: dict = Depends(require_role("driver", "admin")),
+    payload: SetDriverAvailabilityRequest = Depends(json_body(SetDriverAvailabilityRequest)),
+    user: dict = Depends(_DRIVER_OR_ADMIN),
 ):
     driver_id = driver_id.strip()
     driver = DRIVERS_DB.get(driver_id)
@@ -533,13 +1138,16 @@ def set_driver_availability(
     if user["role"] == "driver":
         assert_driver_user_matches(user, driver_id)
 
-    if payload.is_available is True and driver.get("current_order_id"):
+    if payload.is_available is True and driver.current_order_id:
         raise HTTPException(status_code=400, detail="Driver is on an active order and cannot be set to available")
 
-    driver["is_available"] = payload.is_available
-    driver.setdefault("status_timestamps", {})
-    driver["status_timestamps"]["availability_changed"] = now_ts()
-    return driver
+    driver.is_available = payload.is_available
+    if payload.is_available:
+        mark_driver_available(driver_id)
+    else:
+        mark_driver_unavailable(driver_id)
+    driver.status_timestamps["availability_changed"] = now_ts()
+    return ORJSONResponse(driver.as_dict())
 
 
 # ============================================================
@@ -547,51 +1155,52 @@ def set_driver_availability(
 # ============================================================
 
 @app.post("/orders/{order_id}/assign-driver")
-def assign_driver(
+async def assign_driver(
     order_id: str,
-    payload: Optional[AssignDriverRequest] = Body(default=None),
-    user: dict = Depends(require_role("admin")),
+    payload: Optional[AssignDriverRequest] = Depends(json_body(AssignDriverRequest, optional=True)),
+    user: dict = Depends(_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    if order["status"] != "confirmed":
-        raise HTTPException(status_code=400, detail=f"Order must be confirmed before assignment. Current: {order['status']}")
+    if order.status != "confirmed":
+        raise HTTPException(status_code=400, detail=f"Order must be confirmed before assignment. Current: {order.status}")
 
-    if order.get("driver_id"):
+    if order.driver_id:
         raise HTTPException(status_code=409, detail="Order already has a driver assigned")
 
     if payload and payload.driver_id:
-        chosen_driver_id = payload.driver_id.strip()
-        driver = DRIVERS_DB.get(chosen_driver_id)
+        driver = DRIVERS_DB.get(payload.driver_id)
         if not driver:
             raise HTTPException(status_code=404, detail="Driver not found")
-        if driver.get("is_available") is not True or driver.get("current_order_id") is not None:
+        if driver.is_available is not True or driver.current_order_id is not None:
             raise HTTPException(status_code=409, detail="Driver is not available")
     else:
         driver = pick_available_driver()
 
-    driver_payout = order["quote"]["payouts"]["driver_base"]
-    platform_payout = order["quote"]["payouts"]["platform_net"]
+    driver_payout = order.quote["driver_base"]
+    platform_payout = order.quote["platform_net"]
 
-    order["driver_id"] = driver["driver_id"]
-    order["driver_payout_locked"] = driver_payout
-    order["platform_payout_locked"] = platform_payout
+    order.driver_id = driver.driver_id
+    ORDERS_BY_DRIVER.setdefault(driver.driver_id, set()).add(order_id)
+    order.driver_payout_locked = driver_payout
+    order.platform_payout_locked = platform_payout
 
-    safe_transition(order, "assigned")
+    ts = now_ts()
+    safe_transition(order, "assigned", ts)
 
-    driver["is_available"] = False
-    driver["current_order_id"] = order_id
-    driver.setdefault("status_timestamps", {})
-    driver["status_timestamps"]["assigned"] = now_ts()
+    driver.is_available = False
+    driver.current_order_id = order_id
+    mark_driver_unavailable(driver.driver_id)
+    driver.status_timestamps["assigned"] = ts
 
     return {
         "order_id": order_id,
-        "status": order["status"],
-        "driver": {"driver_id": driver["driver_id"], "name": driver["name"], "phone": driver["phone"]},
+        "status": order.status,
+        "driver": {"driver_id": driver.driver_id, "name": driver.name, "phone": driver.phone},
         "payouts_locked": {"driver_payout": driver_payout, "platform_payout": platform_payout},
-        "status_timestamps": order.get("status_timestamps", {}),
+        "status_timestamps": order.status_timestamps,
     }
 
 
@@ -600,45 +1209,47 @@ def assign_driver(
 # ============================================================
 
 @app.post("/orders/{order_id}/location")
-def driver_location_ping(
+async def driver_location_ping(
     order_id: str,
-    payload: DriverLocationPing,
-    user: dict = Depends(require_role("driver", "admin")),
+    payload: DriverLocationPing = Depends(json_body(DriverLocationPing)),
+    user: dict = Depends(_DRIVER_OR_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    if order.get("driver_id") is None:
+    if order.driver_id is None:
         raise HTTPException(status_code=400, detail="Order has no assigned driver")
 
-    if order["status"] not in ["assigned", "picked_up", "en_route"]:
-        raise HTTPException(status_code=400, detail=f"Location updates not allowed in state: {order['status']}")
+    if order.status not in LOCATION_OK_STATES:
+        raise HTTPException(status_code=400, detail=f"Location updates not allowed in state: {order.status}")
 
     if user["role"] == "driver":
         # driver can only update location for their assigned order
-        if order.get("driver_id") != user.get("driver_id"):
+        if order.driver_id != user.get("driver_id"):
             raise HTTPException(status_code=403, detail="Not your order")
 
-    order["driver_last_location"] = {
+    ts = now_ts()
+    order.driver_last_location = {
         "lat": payload.lat,
         "lng": payload.lng,
         "accuracy_meters": payload.accuracy_meters,
-        "ts": now_ts(),
+        "ts": ts,
     }
 
-    order.setdefault("driver_location_history", [])
-    order["driver_location_history"].append(order["driver_last_location"])
-    if len(order["driver_location_history"]) > 50:
-        order["driver_location_history"] = order["driver_location_history"][-50:]
+    history = LOCATION_HISTORY_DB.get(order_id)
+    if history is None:
+        history = LOCATION_HISTORY_DB[order_id] = LocationRing()
+    history.append(payload.lat, payload.lng, payload.accuracy_meters, ts)
+    order.version += 1
 
-    return {
+    return ORJSONResponse({
         "order_id": order_id,
-        "status": order["status"],
-        "driver_id": order.get("driver_id"),
-        "last_location": order["driver_last_location"],
-        "history_count": len(order["driver_location_history"]),
-    }
+        "status": order.status,
+        "driver_id": order.driver_id,
+        "last_location": order.driver_last_location,
+        "history_count": len(history),
+    })
 
 
 # ============================================================
@@ -646,135 +1257,168 @@ def driver_location_ping(
 # ============================================================
 
 @app.post("/orders/{order_id}/pickup")
-def confirm_pickup(
+async def confirm_pickup(
     order_id: str,
-    payload: PickupRequest,
-    user: dict = Depends(require_role("driver", "admin")),
+    payload: PickupRequest = Depends(json_body(PickupRequest)),
+    user: dict = Depends(_DRIVER_OR_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    if order["status"] != "assigned":
-        raise HTTPException(status_code=400, detail=f"Pickup not allowed in state: {order['status']}")
+    if order.status != "assigned":
+        raise HTTPException(status_code=400, detail=f"Pickup not allowed in state: {order.status}")
 
     if user["role"] == "driver":
         assert_driver_user_matches(user, payload.driver_id)
-        if order.get("driver_id") != user.get("driver_id"):
+        if order.driver_id != user.get("driver_id"):
             raise HTTPException(status_code=403, detail="Not your order")
 
     assert_driver_authorized(order, payload.driver_id)
 
-    order["pickup_photo_url"] = payload.pickup_photo_url
-    order["pickup_confirmed_at"] = now_ts()
-    safe_transition(order, "picked_up")
+    order.pickup_photo_url = payload.pickup_photo_url
+    ts = now_ts()
+    order.pickup_confirmed_at = ts
+    safe_transition(order, "picked_up", ts)
 
-    return {"order_id": order_id, "status": order["status"], "pickup_time": order["pickup_confirmed_at"], "message": "Pickup confirmed."}
+    return {"order_id": order_id, "status": order.status, "pickup_time": order.pickup_confirmed_at, "message": "Pickup confirmed."}
 
 
 @app.post("/orders/{order_id}/start-delivery")
-def start_delivery(
+async def start_delivery(
     order_id: str,
-    payload: DriverActionRequest,
-    user: dict = Depends(require_role("driver", "admin")),
+    payload: DriverActionRequest = Depends(json_body(DriverActionRequest)),
+    user: dict = Depends(_DRIVER_OR_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    if order["status"] != "picked_up":
-        raise HTTPException(status_code=400, detail=f"Cannot start delivery from state: {order['status']}")
+    if order.status != "picked_up":
+        raise HTTPException(status_code=400, detail=f"Cannot start delivery from state: {order.status}")
 
     if user["role"] == "driver":
         assert_driver_user_matches(user, payload.driver_id)
-        if order.get("driver_id") != user.get("driver_id"):
+        if order.driver_id != user.get("driver_id"):
             raise HTTPException(status_code=403, detail="Not your order")
 
     assert_driver_authorized(order, payload.driver_id)
 
-    order["delivery_started_at"] = now_ts()
-    safe_transition(order, "en_route")
+    ts = now_ts()
+    order.delivery_started_at = ts
+    safe_transition(order, "en_route", ts)
 
-    return {"order_id": order_id, "status": order["status"], "delivery_started_at": order["delivery_started_at"], "message": "Delivery started."}
+    return {"order_id": order_id, "status": order.status, "delivery_started_at": order.delivery_started_at, "message": "Delivery started."}
 
 
 @app.post("/orders/{order_id}/arrived")
-def mark_arrival(
+async def mark_arrival(
     order_id: str,
-    user: dict = Depends(require_role("driver", "admin")),
+    user: dict = Depends(_DRIVER_OR_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    if order["status"] != "en_route":
-        raise HTTPException(status_code=400, detail=f"Arrival not valid in state: {order['status']}")
+    if order.status != "en_route":
+        raise HTTPException(status_code=400, detail=f"Arrival not valid in state: {order.status}")
 
     # driver must be assigned
     if user["role"] == "driver":
-        if order.get("driver_id") != user.get("driver_id"):
+        if order.driver_id != user.get("driver_id"):
             raise HTTPException(status_code=403, detail="Not your order")
 
-    order["arrival_detected_at"] = now_ts()
-    return {"order_id": order_id, "arrival_time": order["arrival_detected_at"], "message": "Arrived at destination."}
+    order.arrival_detected_at = now_ts()
+    order.version += 1
+    return {"order_id": order_id, "arrival_time": order.arrival_detected_at, "message": "Arrived at destination."}
 
 
 @app.post("/orders/{order_id}/complete-delivery")
-def complete_delivery(
+async def complete_delivery(
     order_id: str,
-    payload: CompleteDeliveryRequest,
-    user: dict = Depends(require_role("driver", "admin")),
+    payload: CompleteDeliveryRequest = Depends(json_body(CompleteDeliveryRequest)),
+    user: dict = Depends(_DRIVER_OR_ADMIN),
 ):
     order = ORDERS_DB.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    if order["status"] != "en_route":
-        raise HTTPException(status_code=400, detail=f"Cannot complete delivery from state: {order['status']}")
+    if order.status != "en_route":
+        raise HTTPException(status_code=400, detail=f"Cannot complete delivery from state: {order.status}")
 
-    if not order.get("arrival_detected_at"):
+    if not order.arrival_detected_at:
         raise HTTPException(status_code=400, detail="Arrival must be detected before completing delivery")
 
     if user["role"] == "driver":
         assert_driver_user_matches(user, payload.driver_id)
-        if order.get("driver_id") != user.get("driver_id"):
+        if order.driver_id != user.get("driver_id"):
             raise HTTPException(status_code=403, detail="Not your order")
 
     assert_driver_authorized(order, payload.driver_id)
 
-    delivery_type = order.get("delivery_type", "hand_to_customer")
-    if delivery_type == "leave_at_door":
-        if not payload.delivery_photo_url:
-            raise HTTPException(status_code=400, detail="Delivery photo required for leave-at-door orders")
-        order["delivery_photo_url"] = payload.delivery_photo_url
-
-    if delivery_type == "hand_to_customer":
-        if payload.handed_to_customer is not True:
-            raise HTTPException(status_code=400, detail="Driver must confirm handoff to customer")
+    COMPLETION_VALIDATORS.get(order.delivery_type, _no_completion_check)(order, payload)
 
-    order["delivered_at"] = now_ts()
-    safe_transition(order, "delivered")
+    ts = now_ts()
+    order.delivered_at = ts
+    safe_transition(order, "delivered", ts)
 
-    driver = DRIVERS_DB.get(order.get("driver_id"))
+    driver = DRIVERS_DB.get(order.driver_id)
     if driver:
-        driver["current_order_id"] = None
-        driver["is_available"] = True
-        driver.setdefault("status_timestamps", {})
-        driver["status_timestamps"]["available"] = now_ts()
+        driver.current_order_id = None
+        driver.is_available = True
+        mark_driver_available(driver.driver_id)
+        driver.status_timestamps["available"] = ts
 
-    delivery_duration = order["delivered_at"] - order.get("delivery_started_at", order["delivered_at"])
+    delivery_duration = order.delivered_at - (order.delivery_started_at or order.delivered_at)
 
     return {
         "order_id": order_id,
-        "status": order["status"],
+        "status": order.status,
         "delivery_time_seconds": delivery_duration,
         "payouts_finalized": {
-            "driver_payout": order["driver_payout_locked"],
-            "platform_payout": order["platform_payout_locked"],
+            "driver_payout": order.driver_payout_locked,
+            "platform_payout": order.platform_payout_locked,
         },
     }
 
 
+# ============================================================
+# OpenAPI
+# - json_body() reads the raw request, so FastAPI doesn't know about the
+#   msgspec bodies; their schemas are generated by msgspec and patched in.
+# ============================================================
+
+def openapi() -> dict:
+    if app.openapi_schema:
+        return app.openapi_schema
+    schema = FastAPI.openapi(app)
+
+    bodies = []  # (route, model, optional)
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for dep in route.dependant.dependencies:
+            model = getattr(dep.call, "body_model", None)
+            if model is not None:
+                bodies.append((route, model, dep.call.body_optional))
+
+    models = list(dict.fromkeys(model for _, model, _ in bodies))
+    model_schemas, components = msgspec.json.schema_components(models, ref_template="#/components/schemas/{name}")
+    by_model = dict(zip(models, model_schemas))
+    schema.setdefault("components", {}).setdefault("schemas", {}).update(components)
+
+    for route, model, optional in bodies:
+        for method in route.methods:
+            schema["paths"][route.path_format][method.lower()]["requestBody"] = {
+                "required": not optional,
+                "content": {"application/json": {"schema": by_model[model]}},
+            }
+    return schema
+
+
+app.openapi = openapi
+
+
 # ============================================================
 # Cloud Run Entrypoint
 # ============================================================
@@ -783,11 +1427,20 @@ if __name__ == "__main__":
     print(">>> Starting Cape Coast API <<<")
     import uvicorn
 
+    # uvloop + httptools come from uvicorn[standard]; access logging is off
+    # because Cloud Run already records every request at the load balancer.
+    # WEB_CONCURRENCY defaults to 1 for the same reason as in the Dockerfile:
+    # every worker would hold its own copy of the in-memory DBs.
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
     uvicorn.run(
-        app,
+        app if workers == 1 else "main:app",  # multiple workers need an import string
         host="0.0.0.0",
         port=int(os.environ.get("PORT", 8080)),
-        log_level="info",
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
         proxy_headers=True,
         forwarded_allow_ips="*",
     )
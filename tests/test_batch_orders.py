@@ -0,0 +1,29 @@
+ORDER = {"food_subtotal": 10.0, "platform_fee": 1.5, "delivery_fee": 2.25, "restaurant_id": "R1"}
+
+
+def test_create_batch_reports_each_item_by_index(client, customer):
+    items = [ORDER, {"food_subtotal": 0, "platform_fee": 1, "delivery_fee": 1, "restaurant_id": "R1"}, ORDER]
+    r = client.post("/orders/batch", json=items, headers=customer)
+    assert r.status_code == 200, r.text
+    results = r.json()
+
+    assert [res["index"] for res in results] == [0, 1, 2]
+    assert [res["ok"] for res in results] == [True, False, True]
+    assert results[1]["status_code"] == 422
+    for res in (results[0], results[2]):
+        assert res["order"]["status"] == "pending"
+        assert client.get(f"/orders/{res['order']['order_id']}", headers=customer).status_code == 200
+
+
+def test_confirm_batch_reports_missing_and_forbidden_items(client, customer, admin):
+    mine = client.post("/orders", json=ORDER, headers=customer).json()["order_id"]
+    theirs = client.post("/orders", json=ORDER, headers=admin).json()["order_id"]
+
+    r = client.post("/orders/batch/confirm", json={"order_ids": [mine, "nope", theirs]}, headers=customer)
+    assert r.status_code == 200, r.text
+    ok, missing, forbidden = r.json()
+
+    assert ok["order_id"] == mine and ok["ok"] is True and ok["status"] == "confirmed"
+    assert missing == {"order_id": "nope", "ok": False, "status_code": 404, "error": "Order not found"}
+    assert forbidden["order_id"] == theirs and forbidden["ok"] is False and forbidden["status_code"] == 403
+    assert client.get(f"/orders/{mine}", headers=customer).json()["status"] == "confirmed"
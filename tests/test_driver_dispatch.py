@@ -0,0 +1,40 @@
+ORDER = {"food_subtotal": 10.0, "platform_fee": 1.5, "delivery_fee": 2.25, "restaurant_id": "R1"}
+
+
+def _auto_assign(client, customer, admin) -> str:
+    order_id = client.post("/orders", json=ORDER, headers=customer).json()["order_id"]
+    assert client.post(f"/orders/{order_id}/confirm", headers=customer).status_code == 200
+    r = client.post(f"/orders/{order_id}/assign-driver", headers=admin)
+    assert r.status_code == 200, r.text
+    return r.json()["driver"]["driver_id"]
+
+
+def test_toggling_availability_sends_driver_to_the_back_of_the_queue(client, customer, admin):
+    a = client.post("/drivers/register", json={"name": "A", "phone": "0244000001"}, headers=admin).json()["driver_id"]
+    b = client.post("/drivers/register", json={"name": "B", "phone": "0244000002"}, headers=admin).json()["driver_id"]
+    for available in (False, True):
+        r = client.patch(f"/drivers/{a}/availability", json={"is_available": available}, headers=admin)
+        assert r.status_code == 200, r.text
+
+    picked = []
+    while a not in picked:
+        picked.append(_auto_assign(client, customer, admin))
+    assert picked.index(b) < picked.index(a)
+
+
+def test_available_only_lists_available_drivers_longest_waiting_first(client, customer, admin):
+    busy = client.post("/drivers/register", json={"name": "C", "phone": "0244000003"}, headers=admin).json()["driver_id"]
+    a = client.post("/drivers/register", json={"name": "D", "phone": "0244000004"}, headers=admin).json()["driver_id"]
+    b = client.post("/drivers/register", json={"name": "E", "phone": "0244000005"}, headers=admin).json()["driver_id"]
+    while _auto_assign(client, customer, admin) != busy:
+        pass
+    client.patch(f"/drivers/{a}/availability", json={"is_available": False}, headers=admin)
+    client.patch(f"/drivers/{a}/availability", json={"is_available": True}, headers=admin)
+
+    r = client.get("/drivers", params={"available_only": "true"}, headers=admin)
+    assert r.status_code == 200, r.text
+    drivers = r.json()
+    assert all(d["is_available"] and d["current_order_id"] is None for d in drivers)
+    listed = [d["driver_id"] for d in drivers]
+    assert busy not in listed
+    assert listed[-2:] == [b, a]
@@ -0,0 +1,32 @@
+ORDER = {"food_subtotal": 10.0, "platform_fee": 1.5, "delivery_fee": 2.25, "restaurant_id": "R1"}
+
+
+def test_get_order_revalidates_until_the_order_changes(client, customer):
+    order_id = client.post("/orders", json=ORDER, headers=customer).json()["order_id"]
+    url = f"/orders/{order_id}"
+
+    first = client.get(url, headers=customer)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"stale", {etag}', "*"):
+        r = client.get(url, headers={**customer, "If-None-Match": if_none_match})
+        assert r.status_code == 304, if_none_match
+        assert r.headers["etag"] == etag
+
+    assert client.post(f"{url}/confirm", headers=customer).status_code == 200
+
+    r = client.get(url, headers={**customer, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["status"] == "confirmed"
+    assert r.headers["etag"] != etag
+
+
+def test_history_view_has_its_own_etag(client, customer):
+    order_id = client.post("/orders", json=ORDER, headers=customer).json()["order_id"]
+    etag = client.get(f"/orders/{order_id}", headers=customer).headers["etag"]
+
+    r = client.get(f"/orders/{order_id}?include_history=true", headers={**customer, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["driver_location_history"] == []
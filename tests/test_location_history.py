@@ -0,0 +1,36 @@
+import main
+
+ORDER = {"food_subtotal": 10.0, "platform_fee": 1.5, "delivery_fee": 2.25, "restaurant_id": "R1"}
+
+
+def test_ring_keeps_the_last_points_oldest_first():
+    ring = main.LocationRing()
+    total = main.LOCATION_HISTORY_LIMIT + 7
+    for i in range(total):
+        ring.append(5.0 + i, -1.0, None if i % 2 else float(i), 1000 + i)
+
+    points = ring.to_list()
+    assert len(ring) == len(points) == main.LOCATION_HISTORY_LIMIT
+    assert [p["ts"] for p in points] == list(range(1000 + 7, 1000 + total))
+    assert points[0] == {"lat": 12.0, "lng": -1.0, "accuracy_meters": None, "ts": 1007}
+    assert [p["accuracy_meters"] for p in points] == [None if i % 2 else float(i) for i in range(7, total)]
+
+
+def test_order_history_returns_last_pings_after_wraparound(client, customer, admin):
+    driver_id = client.post("/drivers/register", json={"name": "Ring", "phone": "0244000011"}, headers=admin).json()["driver_id"]
+    order_id = client.post("/orders", json=ORDER, headers=customer).json()["order_id"]
+    client.post(f"/orders/{order_id}/confirm", headers=customer)
+    assert client.post(f"/orders/{order_id}/assign-driver", json={"driver_id": driver_id}, headers=admin).status_code == 200
+
+    total = main.LOCATION_HISTORY_LIMIT + 5
+    for i in range(total):
+        body = {"lat": 5.0 + i / 1000, "lng": -1.2}
+        if i % 3 == 0:
+            body["accuracy_meters"] = 5
+        r = client.post(f"/orders/{order_id}/location", json=body, headers=admin)
+        assert r.status_code == 200, r.text
+    assert r.json()["history_count"] == main.LOCATION_HISTORY_LIMIT
+
+    history = client.get(f"/orders/{order_id}", params={"include_history": "true"}, headers=customer).json()["driver_location_history"]
+    assert [p["lat"] for p in history] == [5.0 + i / 1000 for i in range(5, total)]
+    assert [p["accuracy_meters"] for p in history] == [5.0 if i % 3 == 0 else None for i in range(5, total)]
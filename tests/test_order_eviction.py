@@ -0,0 +1,28 @@
+import main
+
+ORDER = {"food_subtotal": 10.0, "platform_fee": 1.5, "delivery_fee": 2.25, "restaurant_id": "R1"}
+
+
+def test_delivered_order_is_evicted_from_every_index_after_retention(client, customer, admin):
+    driver_id = client.post("/drivers/register", json={"name": "Evict", "phone": "0244000010"}, headers=admin).json()["driver_id"]
+    order_id = client.post("/orders", json=ORDER, headers=customer).json()["order_id"]
+    client.post(f"/orders/{order_id}/confirm", headers=customer)
+    r = client.post(f"/orders/{order_id}/assign-driver", json={"driver_id": driver_id}, headers=admin)
+    assert r.status_code == 200, r.text
+    client.post(f"/orders/{order_id}/location", json={"lat": 5.1, "lng": -1.2}, headers=admin)
+    for status in ("picked_up", "en_route", "delivered"):
+        r = client.patch(f"/orders/{order_id}/status", json={"new_status": status}, headers=admin)
+        assert r.status_code == 200, r.text
+    delivered_at = r.json()["status_timestamps"]["delivered"]
+    customer_id = main.ORDERS_DB.get(order_id).customer_id
+
+    main.evict_terminal_orders(delivered_at + main.ORDER_RETENTION_SECONDS - 1)
+    assert client.get(f"/orders/{order_id}", headers=customer).status_code == 200
+
+    assert main.evict_terminal_orders(delivered_at + main.ORDER_RETENTION_SECONDS) >= 1
+    assert main.ORDERS_DB.get(order_id) is None
+    assert order_id not in main.LOCATION_HISTORY_DB
+    assert all(order_id not in ids for ids in main.ORDERS_BY_STATUS.values())
+    assert order_id not in main.ORDERS_BY_CUSTOMER.get(customer_id, set())
+    assert driver_id not in main.ORDERS_BY_DRIVER  # its only order: bucket removed
+    assert client.get(f"/orders/{order_id}", headers=customer).status_code == 404
@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.mark.parametrize("amount", [0.29, 10.0, 311799385.54])
+def test_quote_accepts_whole_cent_amounts(client, amount):
+    r = client.post("/orders/quote", json={"food_subtotal": amount, "platform_fee": 0.29, "delivery_fee": 0})
+    assert r.status_code == 200, r.text
+
+
+@pytest.mark.parametrize("field", ["food_subtotal", "platform_fee", "delivery_fee"])
+def test_quote_rejects_fractional_cents(client, field):
+    body = {"food_subtotal": 10.0, "platform_fee": 1.5, "delivery_fee": 2.25, field: 10.005}
+    r = client.post("/orders/quote", json=body)
+    assert r.status_code == 422
+    assert "at most 2 decimal places" in r.text
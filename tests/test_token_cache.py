@@ -0,0 +1,62 @@
+import hashlib
+from collections import OrderedDict
+
+import pytest
+from jose import JWTError
+
+import main
+
+
+@pytest.fixture
+def cache(client, monkeypatch):
+    """An empty token cache plus a counter of real signature checks."""
+    monkeypatch.setattr(main, "_TOKEN_CACHE", OrderedDict())
+    decodes = []
+    real_decode = main.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(main.jwt, "decode", counting_decode)
+    return decodes
+
+
+def _token(email: str) -> str:
+    return main.create_access_token(main.USERS_DB[main.USERS_BY_EMAIL[email]])
+
+
+def test_hits_skip_decoding_until_the_entry_expires(cache, monkeypatch):
+    token = _token("customer@cape.co")
+    user_id, exp = main._verify_token(token)
+    assert main._verify_token(token) == (user_id, exp)
+    assert len(cache) == 1
+
+    # Once the cached expiry has passed the entry is dropped and the token
+    # goes through jose again (which still accepts it on the real clock).
+    monkeypatch.setattr(main, "now_ts", lambda: exp)
+    assert main._verify_token(token) == (user_id, exp)
+    assert len(cache) == 2
+    assert list(main._TOKEN_CACHE) == [hashlib.sha256(token.encode("utf-8")).digest()]
+
+
+def test_expired_token_is_rejected_and_not_cached(cache):
+    user = main.USERS_DB[main.USERS_BY_EMAIL["customer@cape.co"]]
+    expired = main.jwt.encode({"sub": user["user_id"], "exp": main.now_ts() - 10}, main._JWT_KEY, algorithm=main.JWT_ALG)
+    with pytest.raises(JWTError):
+        main._verify_token(expired)
+    assert not main._TOKEN_CACHE
+
+
+def test_cache_evicts_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(main, "_TOKEN_CACHE_SIZE", 2)
+    admin, customer, driver = (_token(e) for e in ("admin@cape.co", "customer@cape.co", "driver@cape.co"))
+    main._verify_token(admin)
+    main._verify_token(customer)
+    main._verify_token(admin)  # hit: admin becomes most recent
+    main._verify_token(driver)  # evicts customer
+    assert len(main._TOKEN_CACHE) == 2
+
+    main._verify_token(admin)
+    main._verify_token(customer)
+    assert cache == [admin, customer, driver, customer]